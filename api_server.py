@@ -1,16 +1,28 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response
+from flask.json.provider import JSONProvider
 import docker
+import orjson
+from waitress import serve
 import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 import uuid
+import itertools
+import secrets
+import bisect
 import sys
+import os
+import atexit
+import signal
 import logging
 import multiprocessing
 
-# Configure logging with more details
+# Configure logging with more details; hot paths log at DEBUG, so the default
+# WARNING level skips their formatting entirely (override with API_LOG_LEVEL)
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.environ.get('API_LOG_LEVEL', 'WARNING').upper(),
     format='%(asctime)s - %(levelname)s - %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
 )
@@ -21,55 +33,433 @@ SYSTEM_CPU_COUNT = multiprocessing.cpu_count()
 MAX_NODE_CPU = min(8, SYSTEM_CPU_COUNT)  # Cap at 8 or system CPU count, whichever is lower
 MAX_POD_CPU = min(6, SYSTEM_CPU_COUNT)   # Cap at 6 or system CPU count, whichever is lower
 
+# Parallel Docker stats reads per heartbeat pass
+STATS_WORKERS = 8
+# Parallel pod container removals when a node's pods are rescheduled
+REMOVE_WORKERS = 8
+
+# Nodes fail the heartbeat check after 3 missed 5-second heartbeats
+HEARTBEAT_TIMEOUT_NS = 15 * 10**9
+
+# Set API_DEBUG=1 to run on the Flask debug server (without the reloader)
+DEBUG = os.environ.get('API_DEBUG') == '1'
+SERVER_THREADS = 8  # waitress request worker threads
+
+# Upper bound (seconds) on any single Docker API call, so a stalled daemon fails
+# the one request or health tick instead of hanging it indefinitely
+DOCKER_TIMEOUT = 20
+# HTTP connections kept to the Docker daemon; the default of 10 is below what the
+# request threads, stats workers and background threads can use at once
+DOCKER_POOL_SIZE = 64
+
+# Node containers and the warm pool add_node starts them from
+NODE_IMAGE = 'python:3.9-slim'
+NODE_COMMAND = 'tail -f /dev/null'  # Keep container running
+NODE_POOL_SIZE = 2
+NODE_POOL_LABEL = 'k8s-simulator.warm-node'
+NODE_POOL_RETRY = 30  # seconds before retrying a failed pool fill
+
 logger.info(f"System CPU count: {SYSTEM_CPU_COUNT}")
 logger.info(f"Maximum node CPU capacity: {MAX_NODE_CPU}")
 logger.info(f"Maximum pod CPU requirement: {MAX_POD_CPU}")
 
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, so jsonify() uses the same encoder as /cluster/status"""
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 
 # In-memory storage for cluster state
-nodes = {}  # {node_id: {cpu_capacity, cpu_available, pods, last_heartbeat, status}}
+nodes = {}  # {node_id: {cpu_capacity, cpu_available, pods, last_heartbeat_ns, status}}
 pods = {}   # {pod_id: {node_id, cpu_required}}
 
+# Guards every compound read or write of `nodes`, `pods` and the Best-Fit index.
+# Reentrant so the helpers below can lock internally and still be called from a
+# caller's critical section. Never hold it across a Docker API call.
+STATE_LOCK = threading.RLock()
+
+# CPU capacity of nodes whose containers are still starting; counted against the
+# system capacity so concurrent add_node calls cannot overcommit the host
+_pending_node_cpu = 0
+
+# Best-Fit index: (cpu_available, node_id) for every healthy node, kept sorted
+# so the scheduler can bisect straight to the tightest fit
+_avail_index = []
+
+def _index_add(node_id):
+    """Insert a node into the Best-Fit index under its current cpu_available"""
+    bisect.insort(_avail_index, (nodes[node_id]['cpu_available'], node_id))
+
+def _index_discard(node_id):
+    """Remove a node from the Best-Fit index if it is present"""
+    entry = (nodes[node_id]['cpu_available'], node_id)
+    i = bisect.bisect_left(_avail_index, entry)
+    if i < len(_avail_index) and _avail_index[i] == entry:
+        del _avail_index[i]
+
+def _set_node_status(node_id, status):
+    """Change a node's status, keeping the Best-Fit index limited to healthy nodes"""
+    with STATE_LOCK:
+        node_info = nodes.get(node_id)
+        if node_info is None or node_info['status'] == status:
+            return
+        if node_info['status'] == 'healthy':
+            _index_discard(node_id)
+        node_info['status'] = status
+        if status == 'healthy':
+            _index_add(node_id)
+    _invalidate_status()
+
+def _adjust_cpu_available(node_id, delta):
+    """Add delta to a node's cpu_available and re-key its Best-Fit index entry"""
+    with STATE_LOCK:
+        node_info = nodes.get(node_id)
+        if node_info is None:
+            return
+        healthy = node_info['status'] == 'healthy'
+        if healthy:
+            _index_discard(node_id)
+        node_info['cpu_available'] += delta
+        if healthy:
+            _index_add(node_id)
+    _invalidate_status()
+
+def _pod_stopped(pod_id):
+    """Detach a pod from its node and hand its CPU back; call once the pod's container is gone"""
+    with STATE_LOCK:
+        pod_info = pods.get(pod_id)
+        if pod_info is None:
+            return
+        node_info = nodes.get(pod_info['node_id'])
+        if node_info is None or pod_id not in node_info['pods']:
+            return  # node gone or pod already released
+        node_info['pods'].discard(pod_id)
+        _adjust_cpu_available(pod_info['node_id'], pod_info['cpu_required'])
+
+# Host ports not yet mapped to a pod container; a pod keeps its port until it
+# fails or is forgotten, so rescheduling does not change its URL
+POD_PORT_RANGE = range(10000, 20000)
+_free_ports = set(POD_PORT_RANGE)
+
+def _take_port(pod_id):
+    """Return the pod's host port, allocating a free one if it has none; None if all are taken"""
+    with STATE_LOCK:
+        pod_info = pods.get(pod_id)
+        if pod_info is not None and pod_info.get('host_port') is not None:
+            return pod_info['host_port']
+        return _free_ports.pop() if _free_ports else None
+
+def _release_port(pod_id, host_port=None):
+    """Hand a pod's host port (the recorded one unless given) back to the free set"""
+    with STATE_LOCK:
+        pod_info = pods.get(pod_id)
+        if pod_info is not None:
+            recorded = pod_info.pop('host_port', None)
+            if host_port is None:
+                host_port = recorded
+        if host_port in POD_PORT_RANGE:
+            _free_ports.add(host_port)
+
+# Pod IDs are a random per-process prefix plus a counter: unique across restarts
+# (pod container names are derived from them) without a uuid4() per pod
+_POD_ID_PREFIX = secrets.token_hex(4)
+_pod_counter = itertools.count()
+_pod_counter_lock = threading.Lock()
+
+def _new_pod_id():
+    """Return a new cluster-unique pod ID"""
+    with _pod_counter_lock:
+        n = next(_pod_counter)
+    return f"{_POD_ID_PREFIX}-{n:08x}"
+
+# Set to run a heartbeat and health check immediately instead of waiting out the interval
+_health_wakeup = threading.Event()
+
+# Set once the server is going down; background loops check it whenever they wake
+_shutdown_event = threading.Event()
+
+def _request_shutdown():
+    """Stop the background loops, waking any that are waiting and closing the event stream"""
+    if _shutdown_event.is_set():
+        return  # SIGTERM already did it before atexit
+    _shutdown_event.set()
+    _health_wakeup.set()
+    _pool_refill.set()
+    if _event_stream is not None:
+        _event_stream.close()
+
+def _handle_sigterm(signum, frame):
+    """Unwind the main thread on SIGTERM so atexit handlers run"""
+    _request_shutdown()
+    sys.exit(0)
+
+# Serialized /cluster/status payload, rebuilt when dirty or older than the TTL
+STATUS_CACHE_TTL = 1.0  # seconds
+_status_cache = {'ts': 0.0, 'blob': b'', 'dirty': True}
+
+def _invalidate_status():
+    """Mark the cached /cluster/status payload as stale after a state change"""
+    _status_cache['dirty'] = True
+
+# The Docker event stream start_event_listener() is reading, if connected
+_event_stream = None
+
+# Live {container_id: state} for every container Docker knows, seeded from one
+# listing and then kept current by HealthMonitor.start_event_listener()
+_container_status = {}
+
+# Container event -> resulting state ('destroy' drops the entry instead)
+_EVENT_STATES = {
+    'create': 'created',
+    'start': 'running',
+    'unpause': 'running',
+    'pause': 'paused',
+    'die': 'exited',
+}
+
+def _seed_container_status():
+    """Replace _container_status with a fresh listing of all containers"""
+    # Low-level listing: one HTTP call, no per-container inspect like containers.list()
+    fresh = {c['Id']: c['State'] for c in client.api.containers(all=True)}
+    _container_status.update(fresh)
+    for container_id in set(_container_status) - fresh.keys():
+        _container_status.pop(container_id, None)
+
+# Previous (total_usage_ns, monotonic_ns) CPU reading per container; one-shot stats
+# carry no precpu sample, so CPU percentages come from consecutive heartbeats
+_cpu_prev = {}
+
+def _cpu_percent(container_id, stats, now_ns):
+    """CPU used since the last reading, as a percentage of the host's CPUs.
+
+    now_ns is the monotonic time the stats were read, not when they are processed.
+    """
+    total_usage = stats['cpu_stats']['cpu_usage']['total_usage']
+    prev = _cpu_prev.get(container_id)
+    _cpu_prev[container_id] = (total_usage, now_ns)
+    if prev is None or now_ns <= prev[1] or total_usage < prev[0]:
+        return 0.0  # first reading, or the container restarted
+    ncpus = stats['cpu_stats'].get('online_cpus') or SYSTEM_CPU_COUNT
+    return (total_usage - prev[0]) / ((now_ns - prev[1]) * ncpus) * 100
+
+# Memory limit per container; constant while it runs, dropped on (re)start
+_mem_limit_cache = {}
+
+def _memory_usage(container_id, stats):
+    """Return (used_bytes, limit_bytes), excluding inactive page cache like the Docker CLI"""
+    memory_stats = stats['memory_stats']
+    detail = memory_stats.get('stats', {})
+    # cgroup v1 reports total_inactive_file, cgroup v2 inactive_file
+    inactive_file = detail.get('total_inactive_file', detail.get('inactive_file', 0))
+    used = memory_stats.get('usage', 0)
+    if inactive_file < used:
+        used -= inactive_file
+    
+    limit = _mem_limit_cache.get(container_id)
+    if limit is None:
+        limit = memory_stats.get('limit')
+        if limit:
+            _mem_limit_cache[container_id] = limit
+    return used, limit or 1
+
+def _remove_container(container_id):
+    """Kill and remove a container with a single Docker call.
+
+    Returns False if the container was already gone; other Docker errors propagate
+    and leave its cached state alone, since the container still exists.
+    """
+    try:
+        client.api.remove_container(container_id, force=True, v=True)
+        removed = True
+    except docker.errors.NotFound:
+        removed = False
+    _container_status.pop(container_id, None)
+    _cpu_prev.pop(container_id, None)
+    _mem_limit_cache.pop(container_id, None)
+    return removed
+
+def _remove_pod_containers(pod_ids):
+    """Remove the containers of several pods in parallel, then release the pods from their node.
+
+    Docker errors are logged, not raised. Returns the set of pods whose container
+    could not be removed: it still holds their name and host port, so they must
+    not be relaunched.
+    """
+    with STATE_LOCK:
+        targets = [(pod_id, pods[pod_id]['container_id']) for pod_id in pod_ids
+                   if pod_id in pods and 'container_id' in pods[pod_id]]
+    
+    def remove(target):
+        pod_id, container_id = target
+        try:
+            if _remove_container(container_id):
+                logger.debug("Removed container for pod %s", pod_id)
+            else:
+                logger.warning(f"Container for pod {pod_id} not found in Docker, may have been already removed")
+            return None
+        except docker.errors.APIError as e:
+            logger.warning(f"Error removing container for pod {pod_id}: {str(e)}")
+            return pod_id
+    
+    not_removed = set()
+    if targets:
+        with ThreadPoolExecutor(max_workers=REMOVE_WORKERS) as executor:
+            not_removed.update(executor.map(remove, targets))
+        not_removed.discard(None)
+    for pod_id in pod_ids:
+        _pod_stopped(pod_id)
+    return not_removed
+
+# Image references known to be present locally, so containers are only created
+# once their image is there instead of pulling inside the create call
+_pulled = set()
+
+def _image_ref(image):
+    """Normalize an image reference the way Docker tags it ('nginx' -> 'nginx:latest')"""
+    if '@' in image or ':' in image.rsplit('/', 1)[-1]:
+        return image
+    return f'{image}:latest'
+
+def _seed_pulled_images():
+    """Record every tagged local image in _pulled"""
+    for img in client.api.images():
+        _pulled.update(img.get('RepoTags') or ())
+
+def _ensure_image(image):
+    """Pull an image unless it is already known to be local; raises on Docker errors"""
+    ref = _image_ref(image)
+    if ref in _pulled:
+        return
+    logger.info(f"Pulling image {ref}")
+    client.images.pull(ref)
+    _pulled.add(ref)
+
+# Pre-created, stopped node containers; add_node only has to start one
+_warm_nodes = queue.Queue()
+_pool_refill = threading.Event()
+
+def _fill_node_pool():
+    """Create stopped node containers until the warm pool holds NODE_POOL_SIZE of them.
+
+    Returns False if a Docker error stopped it short.
+    """
+    while _warm_nodes.qsize() < NODE_POOL_SIZE:
+        try:
+            _ensure_image(NODE_IMAGE)
+            container = client.api.create_container(image=NODE_IMAGE, command=NODE_COMMAND,
+                                                    labels={NODE_POOL_LABEL: 'true'})
+        except docker.errors.DockerException as e:
+            if isinstance(e, docker.errors.ImageNotFound):
+                _pulled.discard(_image_ref(NODE_IMAGE))  # removed behind our back: pull on the next refill
+            logger.error(f"Error pre-creating warm node container: {str(e)}")
+            return False
+        _warm_nodes.put(container['Id'])
+    return True
+
+def run_node_pool_refiller():
+    """Keep the warm node pool topped up; woken by add_node whenever it takes a container"""
+    # Reuse never-started pool containers left behind by a previous run
+    try:
+        for c in client.api.containers(all=True, filters={'label': NODE_POOL_LABEL, 'status': 'created'}):
+            _warm_nodes.put(c['Id'])
+    except docker.errors.DockerException as e:
+        logger.warning(f"Error listing leftover warm node containers: {str(e)}")
+    while not _shutdown_event.is_set():
+        # After a failed fill (e.g. the image pull), retry on a timer as well as on demand
+        _pool_refill.wait(None if _fill_node_pool() else NODE_POOL_RETRY)
+        _pool_refill.clear()
+
+def _start_node_container(node_id):
+    """Start a container for a new node, preferring a warm one from the pool; returns its ID"""
+    while True:
+        try:
+            container_id = _warm_nodes.get_nowait()
+        except queue.Empty:
+            break
+        _pool_refill.set()
+        try:
+            client.api.rename(container_id, f'node-{node_id}')
+            client.api.start(container_id)
+            return container_id
+        except docker.errors.NotFound:
+            continue  # removed behind our back, try the next one
+        except docker.errors.APIError as e:
+            # Don't leak it: the container may already carry this node's name
+            logger.warning(f"Error starting warm node container {container_id[:12]}: {str(e)}")
+            try:
+                _remove_container(container_id)
+            except docker.errors.APIError as remove_error:
+                logger.error(f"Error removing warm node container {container_id[:12]}: {str(remove_error)}")
+                raise e
+    
+    # Pool is empty: fall back to creating the container from scratch, and have
+    # the refiller try again
+    _pool_refill.set()
+    _ensure_image(NODE_IMAGE)
+    container = client.containers.run(
+        NODE_IMAGE,
+        command=NODE_COMMAND,
+        detach=True,
+        name=f'node-{node_id}'
+    )
+    return container.id
+
 def cleanup_orphaned_containers():
     """Clean up containers that exist in our state but not in Docker"""
     logger.info("Cleaning up orphaned containers...")
     
-    # Get all Docker containers
-    docker_containers = {c.id: c for c in client.containers.list(all=True)}
+    # Only ask Docker about the containers we track, as raw rows rather than Container objects
+    known_ids = ({n['container_id'] for n in nodes.values() if 'container_id' in n} |
+                 {p['container_id'] for p in pods.values() if 'container_id' in p})
+    if not known_ids:
+        return
+    docker_containers = {c['Id'] for c in client.api.containers(all=True, filters={'id': list(known_ids)})}
     
-    # Clean up nodes
-    for node_id, node_info in list(nodes.items()):
-        if 'container_id' in node_info:
-            if node_info['container_id'] not in docker_containers:
-                logger.warning(f"Removing node {node_id} - container not found in Docker")
-                del nodes[node_id]
-    
-    # Clean up pods
-    for pod_id, pod_info in list(pods.items()):
-        if 'container_id' in pod_info:
-            if pod_info['container_id'] not in docker_containers:
-                logger.warning(f"Removing pod {pod_id} - container not found in Docker")
-                # Remove pod from its node's pod list
-                if pod_info['node_id'] in nodes:
-                    nodes[pod_info['node_id']]['pods'] = [p for p in nodes[pod_info['node_id']]['pods'] if p != pod_id]
-                del pods[pod_id]
+    with STATE_LOCK:
+        # Clean up nodes
+        for node_id, node_info in list(nodes.items()):
+            if 'container_id' in node_info:
+                if node_info['container_id'] not in docker_containers:
+                    logger.warning(f"Removing node {node_id} - container not found in Docker")
+                    _index_discard(node_id)
+                    del nodes[node_id]
+        
+        # Clean up pods
+        for pod_id, pod_info in list(pods.items()):
+            if 'container_id' in pod_info:
+                if pod_info['container_id'] not in docker_containers:
+                    logger.warning(f"Removing pod {pod_id} - container not found in Docker")
+                    # Remove pod from its node's pod list and return its CPU
+                    _pod_stopped(pod_id)
+                    _release_port(pod_id)
+                    del pods[pod_id]
 
 # Initialize the system
 try:
-    client = docker.from_env()
+    client = docker.from_env(timeout=DOCKER_TIMEOUT, max_pool_size=DOCKER_POOL_SIZE)
     # Test Docker connection
     client.ping()
     logger.info("Successfully connected to Docker")    
-    # List all existing containers
-    existing_containers = client.containers.list()
+    # List all existing containers (raw rows: no Container object or inspect per container)
+    existing_containers = client.api.containers()
     logger.info(f"Found {len(existing_containers)} existing containers")
     for container in existing_containers:
-        logger.info(f"Container: {container.name} (ID: {container.short_id})")
+        logger.info(f"Container: {container['Names'][0].lstrip('/')} (ID: {container['Id'][:12]})")
     
     # Clean up any orphaned containers
     cleanup_orphaned_containers()
     
+    # Container states the scheduler and heartbeats read until the event listener takes over
+    _seed_container_status()
+    
+    # Images already present never need an explicit pull
+    _seed_pulled_images()
+    
 except docker.errors.DockerException as e:
     logger.error("Error: Docker is not running or not properly installed.")
     logger.error("Please make sure Docker Desktop is installed and running.")
@@ -79,10 +469,13 @@ except docker.errors.DockerException as e:
 class NodeManager:
     @staticmethod
     def get_total_allocated_cpu():
-        return sum(node['cpu_capacity'] for node in nodes.values())
+        """CPU of every node in the cluster plus the nodes still being started"""
+        with STATE_LOCK:
+            return sum(node['cpu_capacity'] for node in nodes.values()) + _pending_node_cpu
 
     @staticmethod
     def add_node(cpu_capacity):
+        global _pending_node_cpu
         node_id = str(uuid.uuid4())
         try:
             logger.info(f"Creating new node container with ID: {node_id}")
@@ -99,104 +492,120 @@ class NodeManager:
                 logger.error(error_msg)
                 return {'error': error_msg}
             
-            # Check if adding this node would exceed system capacity
-            total_allocated = NodeManager.get_total_allocated_cpu()
-            if total_allocated + cpu_capacity > SYSTEM_CPU_COUNT:
-                error_msg = f"Cannot add node: Total CPU capacity ({total_allocated + cpu_capacity}) would exceed system capacity ({SYSTEM_CPU_COUNT})"
-                logger.error(error_msg)
-                return {'error': error_msg}
+            # Check if adding this node would exceed system capacity, and reserve the
+            # capacity before starting the container so concurrent adds cannot overcommit
+            with STATE_LOCK:
+                total_allocated = NodeManager.get_total_allocated_cpu()
+                if total_allocated + cpu_capacity > SYSTEM_CPU_COUNT:
+                    error_msg = f"Cannot add node: Total CPU capacity ({total_allocated + cpu_capacity}) would exceed system capacity ({SYSTEM_CPU_COUNT})"
+                    logger.error(error_msg)
+                    return {'error': error_msg}
+                _pending_node_cpu += cpu_capacity
+            reserved = True
             
             # Launch a Docker container for the node
             try:
-                container = client.containers.run(
-                    'python:3.9-slim',
-                    command='tail -f /dev/null',  # Keep container running
-                    detach=True,
-                    name=f'node-{node_id}'
-                )
+                container_id = _start_node_container(node_id)
                 
-                logger.info(f"Container created successfully: {container.name} (ID: {container.short_id})")
+                logger.info(f"Container created successfully: node-{node_id} (ID: {container_id[:12]})")
                 
                 # Only add the node to our data structure if container creation succeeded
-                nodes[node_id] = {
-                    'cpu_capacity': cpu_capacity,
-                    'cpu_available': cpu_capacity,
-                    'pods': [],
-                    'last_heartbeat': datetime.now(),
-                    'status': 'healthy',
-                    'container_id': container.id
-                }
+                with STATE_LOCK:
+                    nodes[node_id] = {
+                        'cpu_capacity': cpu_capacity,
+                        'cpu_available': cpu_capacity,
+                        'pods': set(),  # pod IDs; O(1) add and discard
+                        'last_heartbeat_ns': time.monotonic_ns(),
+                        'status': 'healthy',
+                        'container_id': container_id
+                    }
+                    _index_add(node_id)
+                    # The node now counts itself
+                    _pending_node_cpu -= cpu_capacity
+                    reserved = False
+                # Don't wait for the start event before the node can take pods
+                _container_status[container_id] = 'running'
+                _invalidate_status()
+                _health_wakeup.set()
                 
-                # Start heartbeat thread for this node
-                threading.Thread(target=HealthMonitor.start_heartbeat, args=(node_id,), daemon=True).start()
-                logger.info(f"Started heartbeat monitoring for node {node_id}")
                 return node_id
             except docker.errors.APIError as e:
                 logger.error(f"Docker API error while creating container: {str(e)}")
                 return {'error': f'Docker API error: {str(e)}'}
+            finally:
+                if reserved:
+                    with STATE_LOCK:
+                        _pending_node_cpu -= cpu_capacity
         except Exception as e:
             logger.error(f"Unexpected error while creating node: {str(e)}")
             return {'error': str(e)}
 
     @staticmethod
     def remove_node(node_id):
-        if node_id in nodes:
+        # Take the node out of the cluster in one short critical section; the
+        # Docker calls below run without the lock
+        with STATE_LOCK:
+            node_info = nodes.get(node_id)
+            if node_info is not None:
+                # Store pods that need to be rescheduled, largest first (Best-Fit
+                # Decreasing, same as reschedule_pods), and the container to remove
+                pods_to_reschedule = sorted(node_info['pods'], key=lambda p: pods[p]['cpu_required'] if p in pods else 0, reverse=True)
+                container_id = node_info['container_id']
+                if node_info['status'] == 'healthy':
+                    _index_discard(node_id)
+                del nodes[node_id]
+        if node_info is not None:
+            _invalidate_status()
             try:
                 logger.info(f"Removing node: {node_id}")
-                
-                # Store pods that need to be rescheduled
-                pods_to_reschedule = nodes[node_id]['pods'].copy()
                 logger.info(f"Found {len(pods_to_reschedule)} pods to reschedule")
                 
-                # Get container information from our data structure
-                container_id = nodes[node_id]['container_id']
-                
-                # Try to get the container from Docker
+                # Kill and remove the node container
                 try:
-                    container = client.containers.get(container_id)
-                    
-                    # Try to stop and remove the container
-                    try:
-                        container.stop()
-                        container.remove()
+                    if _remove_container(container_id):
                         logger.info(f"Container for node {node_id} stopped and removed successfully")
-                    except docker.errors.APIError as e:
-                        logger.error(f"Error stopping/removing container: {str(e)}")
-                        return {'error': f'Docker API error: {str(e)}'}
-                except docker.errors.NotFound:
-                    logger.warning(f"Container for node {node_id} not found in Docker, may have been already removed")
+                    else:
+                        logger.warning(f"Container for node {node_id} not found in Docker, may have been already removed")
+                except docker.errors.APIError as e:
+                    logger.error(f"Error stopping/removing container: {str(e)}")
+                    # The container is still there: put the node back
+                    with STATE_LOCK:
+                        nodes[node_id] = node_info
+                        if node_info['status'] == 'healthy':
+                            _index_add(node_id)
+                    _invalidate_status()
+                    return {'error': f'Docker API error: {str(e)}'}
                 
-                # Remove the node from our data structure
-                del nodes[node_id]
+                _health_wakeup.set()
                 logger.info(f"Successfully removed node {node_id} from cluster")
 
                 # Now reschedule all pods from the removed node
                 rescheduled_pods = []
                 failed_pods = []
                 
+                # Remove all the pod containers at once, then place the pods one by one
+                not_removed = _remove_pod_containers(pods_to_reschedule)
                 for pod_id in pods_to_reschedule:
-                    if pod_id in pods:
-                        pod_info = pods[pod_id]
-                        logger.info(f"Attempting to reschedule pod {pod_id}")
-                        
-                        # Try to stop and remove the pod container
-                        try:
-                            if 'container_id' in pod_info:
-                                container = client.containers.get(pod_info['container_id'])
-                                container.stop()
-                                container.remove()
-                        except (docker.errors.NotFound, docker.errors.APIError) as e:
-                            logger.warning(f"Error removing pod container: {str(e)}")
+                    pod_info = pods.get(pod_id)
+                    if pod_info is not None:
+                        if pod_id in not_removed:
+                            # Old container still holds the pod's name and port
+                            pod_info['status'] = 'failed'
+                            failed_pods.append(pod_id)
+                            logger.error(f"Cannot reschedule pod {pod_id}: its old container could not be removed")
+                            continue
+                        logger.debug("Attempting to reschedule pod %s", pod_id)
                         
-                        # Try to reschedule the pod
-                        new_pod_id = PodScheduler.schedule_pod(pod_info['cpu_required'], pod_info.get('image', 'nginx:latest'))
+                        # Try to reschedule the pod under its existing ID
+                        new_node_id = PodScheduler._launch(pod_id, pod_info['cpu_required'], pod_info.get('image', 'nginx:latest'))
                         
-                        if isinstance(new_pod_id, dict):  # Scheduling failed
+                        if isinstance(new_node_id, dict):  # Scheduling failed
+                            pod_info['status'] = 'failed'
                             failed_pods.append(pod_id)
                             logger.error(f"Failed to reschedule pod {pod_id}")
                         else:
                             rescheduled_pods.append(pod_id)
-                            logger.info(f"Successfully rescheduled pod {pod_id}")
+                            logger.debug("Rescheduled pod %s to node %s", pod_id, new_node_id)
                 
                 return {
                     'message': f'Node {node_id} removed successfully',
@@ -210,9 +619,133 @@ class NodeManager:
         return {'error': 'Node not found'}
 
 class PodScheduler:
+    @staticmethod
+    def _place(pod_id, cpu_required):
+        """Reserve cpu_required on the Best-Fit healthy node and return its ID, or None if nothing fits"""
+        with STATE_LOCK:
+            # Best-Fit: bisect to the healthy node with the least spare CPU that still fits
+            idx = bisect.bisect_left(_avail_index, (cpu_required, ''))
+            while idx < len(_avail_index):
+                node_id = _avail_index[idx][1]
+                node_info = nodes[node_id]
+                
+                # Verify Docker container exists and is running. A dead node is only
+                # skipped here: check_health() fails it and reschedules its pods
+                state = _container_status.get(node_info['container_id'])
+                if state is None:
+                    logger.warning(f"Node {node_id} container not found in Docker")
+                    _health_wakeup.set()
+                    idx += 1
+                    continue
+                if state != 'running':
+                    logger.warning(f"Node {node_id} container is not running (status: {state})")
+                    _health_wakeup.set()
+                    idx += 1
+                    continue
+                break
+            else:
+                logger.error(f"No suitable node found for pod {pod_id} requiring {cpu_required} CPU cores")
+                return None
+            
+            # Reserve the CPU before starting the container so concurrent requests
+            # cannot overcommit the same node while Docker is busy
+            _adjust_cpu_available(node_id, -cpu_required)
+            return node_id
+
+    @staticmethod
+    def _launch(pod_id, cpu_required, image):
+        """Place a pod and start its container; returns the node ID or an error dict.
+
+        Reuses the entry in `pods` when the pod already exists, so rescheduling keeps its ID.
+        If the chosen node is removed or fails while the container starts, the pod is placed again.
+        """
+        host_port = None
+        while True:
+            node_id = PodScheduler._place(pod_id, cpu_required)
+            if node_id is None:
+                _release_port(pod_id, host_port)  # a pod being rescheduled gives up its port
+                return {'error': f'No node has {cpu_required} CPU cores available. Current nodes are at capacity.'}
+            
+            # Allocated here rather than hashed from the ID, so two pods never race for a bind
+            if host_port is None:
+                host_port = _take_port(pod_id)
+            if host_port is None:
+                _adjust_cpu_available(node_id, cpu_required)
+                logger.error(f"No free host port left for pod {pod_id}")
+                return {'error': f'No free host ports left in {POD_PORT_RANGE.start}-{POD_PORT_RANGE.stop - 1}'}
+            
+            # Create an actual container for the pod
+            try:
+                # Pull first (a no-op for known images) so a new image is fetched explicitly, not inside run()
+                _ensure_image(image)
+                
+                # Launch container for the pod
+                pod_container = client.containers.run(
+                    image=image,
+                    detach=True,
+                    name=f'pod-{pod_id}',
+                    ports={'80/tcp': host_port},
+                    environment={
+                        'POD_ID': pod_id,
+                        'NODE_ID': node_id
+                    }
+                )
+                
+                logger.debug("Created pod container: %s (ID: %s)", pod_container.name, pod_container.short_id)
+                _container_status[pod_container.id] = 'running'
+                
+                with STATE_LOCK:
+                    # Update resource allocation, but only on a node that is still healthy:
+                    # a node failed meanwhile has already taken its pod snapshot for
+                    # rescheduling, so a pod added now would never be moved
+                    node_info = nodes.get(node_id)
+                    placed = node_info is not None and node_info['status'] == 'healthy'
+                    if placed:
+                        node_info['pods'].add(pod_id)
+                        
+                        # Store pod information
+                        pod_info = pods.setdefault(pod_id, {'created_at': datetime.now().isoformat()})
+                        pod_info.update({
+                            'node_id': node_id,
+                            'cpu_required': cpu_required,
+                            'container_id': pod_container.id,
+                            'status': 'running',
+                            'image': image,
+                            'host_port': host_port
+                        })
+                    else:
+                        _adjust_cpu_available(node_id, cpu_required)  # no-op if the node is gone
+                
+                if not placed:
+                    # The node was removed or failed while the container started: drop the
+                    # container and place the pod again (the node is out of the index)
+                    logger.warning(f"Node {node_id} was removed or failed while pod {pod_id} started, placing it again")
+                    try:
+                        _remove_container(pod_container.id)
+                    except docker.errors.APIError as e:
+                        # Keep the port: the container still binds it
+                        logger.error(f"Error removing pod container from lost node: {str(e)}")
+                        return {'error': f'Failed to remove pod container from lost node: {str(e)}'}
+                    continue
+                
+                _invalidate_status()
+                logger.debug("Scheduled pod %s on node %s (http://localhost:%s)", pod_id, node_id, host_port)
+                return node_id
+                
+            except docker.errors.APIError as e:
+                _adjust_cpu_available(node_id, cpu_required)  # release the reservation
+                _release_port(pod_id, host_port)
+                logger.error(f"Docker API error while creating pod container: {str(e)}")
+                return {'error': f'Failed to create pod container: {str(e)}'}
+            except Exception as e:
+                _adjust_cpu_available(node_id, cpu_required)
+                _release_port(pod_id, host_port)
+                logger.error(f"Unexpected error while creating pod container: {str(e)}")
+                return {'error': f'Unexpected error: {str(e)}'}
+
     @staticmethod
     def schedule_pod(cpu_required, image="nginx:latest"):
-        logger.info(f"Attempting to schedule pod requiring {cpu_required} CPU cores, image: {image}")
+        logger.debug("Scheduling pod requiring %s CPU cores, image: %s", cpu_required, image)
         
         # Validate CPU requirement
         if cpu_required <= 0:
@@ -228,182 +761,169 @@ class PodScheduler:
             logger.error("No nodes available in the cluster")
             return {'error': 'No nodes available in the cluster'}
         
-        # First-Fit algorithm implementation with proper CPU validation
-        suitable_nodes = []
-        for node_id, node_info in nodes.items():
-            # Skip unhealthy nodes
-            if node_info['status'] != 'healthy':
-                logger.info(f"Skipping unhealthy node {node_id}")
-                continue
-            
-            # Verify Docker container exists and is running
-            try:
-                container = client.containers.get(node_info['container_id'])
-                if container.status != 'running':
-                    logger.warning(f"Node {node_id} container is not running (status: {container.status})")
-                    node_info['status'] = 'unhealthy'
-                    continue
-            except docker.errors.NotFound:
-                logger.warning(f"Node {node_id} container not found in Docker")
-                node_info['status'] = 'unhealthy'
-                continue
-            except Exception as e:
-                logger.warning(f"Error checking node {node_id} container: {str(e)}")
-                continue
-            
-            # Calculate current CPU usage
-            current_cpu_usage = sum(pods[pod_id]['cpu_required'] for pod_id in node_info['pods'] if pod_id in pods)
-            cpu_available = node_info['cpu_capacity'] - current_cpu_usage
-            
-            # Update node's available CPU
-            node_info['cpu_available'] = cpu_available
-            
-            # Check if node has enough CPU
-            if cpu_available >= cpu_required:
-                suitable_nodes.append((node_id, node_info))
-        
-        # Sort nodes by available CPU (most available first)
-        suitable_nodes.sort(key=lambda x: x[1]['cpu_available'], reverse=True)
-        
-        if not suitable_nodes:
-            logger.error(f"No suitable node found for pod requiring {cpu_required} CPU cores")
-            return {'error': f'No node has {cpu_required} CPU cores available. Current nodes are at capacity.'}
-        
-        # Use the node with most available CPU
-        node_id, node_info = suitable_nodes[0]
-        pod_id = str(uuid.uuid4())
-        
-        # Create an actual container for the pod
-        try:
-            # Use a random port between 10000-20000 for port mapping
-            host_port = 10000 + (hash(pod_id) % 10000)
-            
-            # Launch container for the pod
-            pod_container = client.containers.run(
-                image=image,
-                detach=True,
-                name=f'pod-{pod_id}',
-                ports={'80/tcp': host_port},
-                environment={
-                    'POD_ID': pod_id,
-                    'NODE_ID': node_id
-                }
-            )
-            
-            logger.info(f"Created pod container: {pod_container.name} (ID: {pod_container.short_id})")
-            
-            # Update resource allocation
-            node_info['cpu_available'] -= cpu_required
-            node_info['pods'].append(pod_id)
-            
-            # Store pod information
-            pods[pod_id] = {
-                'node_id': node_id,
-                'cpu_required': cpu_required,
-                'created_at': datetime.now().isoformat(),
-                'container_id': pod_container.id,
-                'status': 'running',
-                'image': image,
-                'host_port': host_port
-            }
-            
-            logger.info(f"Successfully scheduled pod {pod_id} on node {node_id}")
-            logger.info(f"Pod is accessible at http://localhost:{host_port}")
-            logger.info(f"Node {node_id} now has {node_info['cpu_available']} CPU cores available")
-            return pod_id
-            
-        except docker.errors.APIError as e:
-            logger.error(f"Docker API error while creating pod container: {str(e)}")
-            return {'error': f'Failed to create pod container: {str(e)}'}
-        except Exception as e:
-            logger.error(f"Unexpected error while creating pod container: {str(e)}")
-            return {'error': f'Unexpected error: {str(e)}'}
+        pod_id = _new_pod_id()
+        result = PodScheduler._launch(pod_id, cpu_required, image)
+        if isinstance(result, dict):
+            return result
+        return pod_id
 
     @staticmethod
     def reschedule_pods(failed_node_id):
-        if failed_node_id not in nodes:
-            logger.error(f"Failed node not found: {failed_node_id}")
-            return
+        with STATE_LOCK:
+            if failed_node_id not in nodes:
+                logger.error(f"Failed node not found: {failed_node_id}")
+                return
+            
+            failed_pods = nodes[failed_node_id]['pods'].copy()
+            logger.debug("Rescheduling %d pods from failed node %s", len(failed_pods), failed_node_id)
+            
+            for pod_id in failed_pods:
+                if pod_id not in pods:
+                    logger.warning(f"Pod {pod_id} not found in pods list, skipping")
+            
+            # Best-Fit Decreasing: place the largest pods first so the small ones
+            # fill the gaps they leave instead of fragmenting the remaining capacity
+            items = sorted(((pods[p]['cpu_required'], p) for p in failed_pods if p in pods), reverse=True)
         
-        failed_pods = nodes[failed_node_id]['pods']
-        logger.info(f"Rescheduling {len(failed_pods)} pods from failed node {failed_node_id}")
+        # Remove the failed pod containers in parallel. The pods no longer run on the
+        # failed node: stop reporting them there and give their CPU back, so the
+        # accounting is right if the node recovers
+        not_removed = _remove_pod_containers([pod_id for _, pod_id in items])
         
-        for pod_id in failed_pods:
-            if pod_id not in pods:
-                logger.warning(f"Pod {pod_id} not found in pods list, skipping")
-                continue
-                
+        for _, pod_id in items:
             pod_info = pods[pod_id]
-            logger.info(f"Attempting to reschedule pod {pod_id}")
-            
-            # Try to stop and remove the failed pod container if it exists
-            try:
-                if 'container_id' in pod_info:
-                    container = client.containers.get(pod_info['container_id'])
-                    container.stop()
-                    container.remove()
-                    logger.info(f"Removed failed pod container for pod {pod_id}")
-            except docker.errors.NotFound:
-                logger.warning(f"Failed pod container not found in Docker, may have been already removed")
-            except Exception as e:
-                logger.warning(f"Error removing failed pod container: {str(e)}")
+            if pod_id in not_removed:
+                # Old container still holds the pod's name and port
+                pod_info['status'] = 'failed'
+                logger.error(f"Cannot reschedule pod {pod_id}: its old container could not be removed")
+                continue
+            logger.debug("Attempting to reschedule pod %s", pod_id)
             
-            # Try to reschedule the pod
+            # Try to reschedule the pod under its existing ID
             image = pod_info.get('image', 'nginx:latest')
-            new_node_id = PodScheduler.schedule_pod(pod_info['cpu_required'], image)
+            new_node_id = PodScheduler._launch(pod_id, pod_info['cpu_required'], image)
             
             if isinstance(new_node_id, dict):
                 # If rescheduling failed, mark pod as failed
                 pods[pod_id]['status'] = 'failed'
                 logger.error(f"Failed to reschedule pod {pod_id}")
             else:
-                logger.info(f"Successfully rescheduled pod {pod_id} to node {new_node_id}")
+                logger.debug("Rescheduled pod %s to node %s", pod_id, new_node_id)
                 
         # Clear the failed node's pod list after rescheduling
-        nodes[failed_node_id]['pods'] = []
+        with STATE_LOCK:
+            node_info = nodes.get(failed_node_id)
+            if node_info is not None:
+                node_info['pods'].clear()
+        _invalidate_status()
 
 class HealthMonitor:
     @staticmethod
-    def start_heartbeat(node_id):
-        logger.info(f"Starting heartbeat monitoring for node {node_id}")
-        while True:
-            if node_id in nodes:
+    def _fetch_stats(container_id):
+        """Single cgroup read of a container's stats, as (stats, monotonic_ns read time).
+
+        Returns the exception in place of the stats instead of raising.
+        """
+        try:
+            stats = client.api.stats(container_id, stream=False, one_shot=True)
+            return stats, time.monotonic_ns()
+        except Exception as e:
+            return e, None
+
+    @staticmethod
+    def record_heartbeats(executor):
+        """Stamp a heartbeat and refresh metrics for every node whose container is running.
+
+        Container states come from the event-driven cache, and the stats of every
+        running node and pod container are fetched in parallel on `executor`.
+        """
+        container_states = dict(_container_status)
+        
+        # Work out which containers to read before touching Docker
+        targets = {}  # {node_id: (container_id, container_status, [pod_id, ...])}
+        container_ids = []
+        with STATE_LOCK:
+            for node_id, node_info in nodes.items():
+                container_id = node_info['container_id']
+                container_status = container_states.get(container_id, 'not found')
+                targets[node_id] = (container_id, container_status, node_info['pods'].copy())
+                if container_status != 'running':
+                    continue
+                container_ids.append(container_id)
+                for pod_id in node_info['pods']:
+                    pod_info = pods.get(pod_id)
+                    if pod_info and container_states.get(pod_info.get('container_id')) == 'running':
+                        container_ids.append(pod_info['container_id'])
+        all_stats, read_ns = {}, {}
+        for container_id, (stats, ts) in zip(container_ids, executor.map(HealthMonitor._fetch_stats, container_ids)):
+            all_stats[container_id] = stats
+            read_ns[container_id] = ts
+        
+        # Merge everything back into the cluster state in one pass
+        with STATE_LOCK:
+            for node_id, (container_id, container_status, node_pods) in targets.items():
+                node_info = nodes.get(node_id)
+                if node_info is None:
+                    continue  # removed while we were reading stats
+                
+                if container_status != 'running':
+                    # No heartbeat: check_health() fails the node on container status
+                    node_info['health_metrics'] = {
+                        'container_status': container_status,
+                        'last_error': 'Node container is not running',
+                        'error_time': datetime.now().isoformat()
+                    }
+                    continue
+                
                 try:
-                    # Get container stats for the node
-                    container = client.containers.get(nodes[node_id]['container_id'])
-                    stats = container.stats(stream=False)  # Get current stats
+                    stats = all_stats[container_id]
+                    if isinstance(stats, Exception):
+                        raise stats
                     
                     # Calculate health metrics for the node
-                    cpu_usage = stats['cpu_stats']['cpu_usage']['total_usage']
-                    memory_usage = stats['memory_stats'].get('usage', 0)
-                    memory_limit = stats['memory_stats'].get('limit', 1)
+                    cpu_percent = _cpu_percent(container_id, stats, read_ns[container_id])
+                    memory_usage, memory_limit = _memory_usage(container_id, stats)
                     memory_percent = (memory_usage / memory_limit) * 100
                     
                     # Collect pod-specific metrics
                     pod_stats = {}
-                    for pod_id in nodes[node_id]['pods']:
+                    for pod_id in node_pods:
                         if pod_id in pods and 'container_id' in pods[pod_id]:
+                            pod_status = container_states.get(pods[pod_id]['container_id'])
+                            if pod_status is None:
+                                pod_stats[pod_id] = {
+                                    'error': 'Pod container not found',
+                                    'status': 'unknown'
+                                }
+                                continue
                             try:
-                                pod_container = client.containers.get(pods[pod_id]['container_id'])
-                                pod_container_stats = pod_container.stats(stream=False)
-                                
-                                # Calculate pod-specific metrics
-                                pod_cpu_usage = pod_container_stats['cpu_stats']['cpu_usage']['total_usage']
-                                pod_memory_usage = pod_container_stats['memory_stats'].get('usage', 0)
-                                pod_memory_limit = pod_container_stats['memory_stats'].get('limit', 1)
-                                pod_memory_percent = (pod_memory_usage / pod_memory_limit) * 100
+                                pod_memory_usage = pod_memory_limit = pod_cpu_usage = 0
+                                pod_memory_percent = pod_cpu_percent = 0
+                                if pod_status == 'running':
+                                    pod_container_stats = all_stats.get(pods[pod_id]['container_id'])
+                                    if pod_container_stats is None:
+                                        raise KeyError('pod container changed while stats were read')
+                                    if isinstance(pod_container_stats, Exception):
+                                        raise pod_container_stats
+                                    
+                                    # Calculate pod-specific metrics
+                                    pod_cpu_usage = pod_container_stats['cpu_stats']['cpu_usage']['total_usage']
+                                    pod_cpu_percent = _cpu_percent(pods[pod_id]['container_id'], pod_container_stats, read_ns[pods[pod_id]['container_id']])
+                                    pod_memory_usage, pod_memory_limit = _memory_usage(pods[pod_id]['container_id'], pod_container_stats)
+                                    pod_memory_percent = (pod_memory_usage / pod_memory_limit) * 100
                                 
                                 # Store pod metrics
                                 pod_stats[pod_id] = {
                                     'cpu_usage': pod_cpu_usage,
+                                    'cpu_percent': pod_cpu_percent,
                                     'memory_usage': pod_memory_usage,
                                     'memory_limit': pod_memory_limit,
                                     'memory_percent': pod_memory_percent,
-                                    'status': pod_container.status
+                                    'status': pod_status
                                 }
                                 
                                 # Update pod status in the pods dictionary
-                                pods[pod_id]['status'] = pod_container.status
+                                pods[pod_id]['status'] = pod_status
                             except Exception as e:
                                 logger.warning(f"Error getting stats for pod {pod_id}: {str(e)}")
                                 pod_stats[pod_id] = {
@@ -412,42 +932,89 @@ class HealthMonitor:
                                 }
                     
                     # Update node health information
-                    nodes[node_id].update({
-                        'last_heartbeat': datetime.now(),
-                        'status': 'healthy',
+                    node_info.update({
+                        'last_heartbeat_ns': time.monotonic_ns(),
                         'health_metrics': {
-                            'cpu_usage_percent': cpu_usage,
+                            'cpu_usage_percent': cpu_percent,
                             'memory_usage_percent': memory_percent,
                             'memory_usage_mb': memory_usage / (1024 * 1024),
                             'memory_limit_mb': memory_limit / (1024 * 1024),
-                            'running_pods': len(nodes[node_id]['pods']),
-                            'container_status': container.status,
+                            'running_pods': len(node_pods),
+                            'container_status': container_status,
                             'last_error': None,
                             'pod_stats': pod_stats
                         }
                     })
                 except Exception as e:
-                    # Update node with error information
-                    if node_id in nodes:
-                        nodes[node_id].update({
-                            'last_heartbeat': datetime.now(),
-                            'status': 'unhealthy',
-                            'health_metrics': {
-                                'last_error': str(e),
-                                'error_time': datetime.now().isoformat()
-                            }
-                        })
+                    # Update node with error information. The container is still running,
+                    # so keep its status; without a fresh heartbeat, a node whose stats
+                    # keep failing is failed by the heartbeat timeout, not the first error
+                    node_info['health_metrics'] = {
+                        'container_status': container_status,
+                        'last_error': str(e),
+                        'error_time': datetime.now().isoformat()
+                    }
                     logger.error(f"Error updating health metrics for node {node_id}: {str(e)}")
-            time.sleep(5)  # Send heartbeat every 5 seconds
+        
+        # Fresh metrics: the next /cluster/status request rebuilds instead of serving the cached copy
+        _invalidate_status()
+
+    @staticmethod
+    def start_event_listener():
+        """Keep _container_status current from Docker's container event stream"""
+        global _event_stream
+        while not _shutdown_event.is_set():
+            try:
+                events = _event_stream = client.events(decode=True, filters={
+                    'type': 'container',
+                    'event': list(_EVENT_STATES) + ['destroy']
+                })
+                # Re-list after subscribing so nothing that happened in between is missed
+                _seed_container_status()
+                for event in events:
+                    # Newer engines drop the deprecated top-level id/status fields
+                    container_id = (event.get('Actor') or {}).get('ID') or event.get('id')
+                    action = event.get('Action') or event.get('status')
+                    if action in ('start', 'destroy'):
+                        # A (re)started container may come back with different limits
+                        _mem_limit_cache.pop(container_id, None)
+                    if action == 'destroy':
+                        _container_status.pop(container_id, None)
+                    elif action in _EVENT_STATES:
+                        _container_status[container_id] = _EVENT_STATES[action]
+                if _shutdown_event.is_set():
+                    return  # closed by _request_shutdown()
+                logger.warning("Docker event stream ended, reconnecting")
+            except Exception as e:
+                if _shutdown_event.is_set():
+                    return
+                logger.error(f"Docker event stream failed, reconnecting: {str(e)}")
+                _shutdown_event.wait(1)
+
+    @staticmethod
+    def run_stats_loop():
+        """The one heartbeat thread: records heartbeats for all nodes, then judges node health on
+        the metrics it just wrote, every 5 seconds"""
+        with ThreadPoolExecutor(max_workers=STATS_WORKERS) as executor:
+            while not _shutdown_event.is_set():
+                HealthMonitor.record_heartbeats(executor)
+                HealthMonitor.check_health()
+                # Every 5 seconds, or right away when a node is added, removed or found dead
+                # (or the server shuts down)
+                _health_wakeup.wait(5.0)
+                _health_wakeup.clear()
 
     @staticmethod
     def check_health():
-        while True:
-            current_time = datetime.now()
-            for node_id, node_info in list(nodes.items()):  # Use list() to avoid modification during iteration
+        """Mark nodes healthy or unhealthy from their latest metrics and reschedule the pods of newly failed ones"""
+        current_time = datetime.now()
+        now_ns = time.monotonic_ns()
+        newly_failed = []
+        with STATE_LOCK:
+            for node_id, node_info in nodes.items():
                 try:
                     # Check for missed heartbeats
-                    heartbeat_age = (current_time - node_info['last_heartbeat']).seconds
+                    heartbeat_age_ns = now_ns - node_info['last_heartbeat_ns']
                     
                     # Get health metrics
                     health_metrics = node_info.get('health_metrics', {})
@@ -457,7 +1024,7 @@ class HealthMonitor:
                     
                     # Define health conditions
                     conditions = {
-                        'heartbeat': heartbeat_age <= 15,  # Less than 3 missed heartbeats
+                        'heartbeat': heartbeat_age_ns <= HEARTBEAT_TIMEOUT_NS,  # Less than 3 missed heartbeats
                         'memory': memory_percent < 90,     # Memory usage below 90%
                         'container': container_status == 'running',
                         'pods': running_pods <= node_info.get('cpu_capacity', 0) * 2  # Basic pod density check
@@ -467,19 +1034,19 @@ class HealthMonitor:
                     if all(conditions.values()):
                         if node_info['status'] != 'healthy':
                             logger.info(f"Node {node_id} recovered and marked as healthy")
-                            node_info['status'] = 'healthy'
+                            _set_node_status(node_id, 'healthy')
                     else:
                         if node_info['status'] == 'healthy':
                             logger.warning(f"Node {node_id} marked as unhealthy - Failed conditions: {[k for k,v in conditions.items() if not v]}")
-                            node_info['status'] = 'unhealthy'
-                            PodScheduler.reschedule_pods(node_id)
+                            _set_node_status(node_id, 'unhealthy')
+                            newly_failed.append(node_id)
                     
                     # Update detailed health status
                     node_info['health_status'] = {
                         'conditions': conditions,
                         'last_check': current_time.isoformat(),
                         'details': {
-                            'heartbeat_age_seconds': heartbeat_age,
+                            'heartbeat_age_seconds': heartbeat_age_ns / 1e9,
                             'memory_usage_percent': memory_percent,
                             'running_pods': running_pods,
                             'container_status': container_status
@@ -489,10 +1056,13 @@ class HealthMonitor:
                 except Exception as e:
                     logger.error(f"Error checking health for node {node_id}: {str(e)}")
                     if node_info['status'] == 'healthy':
-                        node_info['status'] = 'unhealthy'
-                        PodScheduler.reschedule_pods(node_id)
-            
-            time.sleep(5)  # Check every 5 seconds
+                        _set_node_status(node_id, 'unhealthy')
+                        newly_failed.append(node_id)
+        _invalidate_status()  # health_status was rewritten for every node
+        
+        # Rescheduling talks to Docker, so it runs after the state lock is released
+        for node_id in newly_failed:
+            PodScheduler.reschedule_pods(node_id)
 
 # API Endpoints
 @app.route('/nodes', methods=['POST'])
@@ -536,7 +1106,7 @@ def remove_node(node_id):
 
 @app.route('/pods', methods=['POST'])
 def create_pod():
-    logger.info("Received request to create pod")
+    logger.debug("Received request to create pod")
     data = request.get_json()
     if not data:
         logger.error("No JSON data received")
@@ -579,34 +1149,59 @@ def create_pod():
 
 @app.route('/cluster/status', methods=['GET'])
 def get_cluster_status():
-    logger.info("Received request for cluster status")
-    status = {
-        'nodes': {
-            node_id: {
+    logger.debug("Received request for cluster status")
+    mono_now = time.monotonic()
+    if not _status_cache['dirty'] and mono_now - _status_cache['ts'] <= STATUS_CACHE_TTL:
+        return Response(_status_cache['blob'], mimetype='application/json')
+    
+    # Clear the flag before reading state so a concurrent change re-dirties it
+    _status_cache['dirty'] = False
+    # Heartbeats are monotonic timestamps; map them onto wall-clock time once per rebuild
+    wall_now, mono_now_ns = datetime.now(), time.monotonic_ns()
+    # Build the payload under the lock, serialize it after releasing (orjson encodes datetimes itself)
+    node_status = {}
+    with STATE_LOCK:
+        for node_id, info in nodes.items():
+            hm = info.get('health_metrics') or {}
+            pod_stats = hm.get('pod_stats') or {}
+            pod_entries = []
+            for pod_id in info['pods']:
+                p = pods.get(pod_id)
+                pod_entries.append({
+                    'id': pod_id,
+                    'cpu_required': p['cpu_required'] if p else 0,
+                    'status': p['status'] if p else 'unknown',
+                    'metrics': pod_stats.get(pod_id) or {}
+                })
+            node_status[node_id] = {
                 'cpu_capacity': info['cpu_capacity'],
                 'cpu_available': info['cpu_available'],
                 'status': info['status'],
-                'health_metrics': info.get('health_metrics', {}),
-                'health_status': info.get('health_status', {}),
-                'pods': [
-                    {
-                        'id': pod_id,
-                        'cpu_required': pods[pod_id]['cpu_required'] if pod_id in pods else 0,
-                        'status': pods[pod_id]['status'] if pod_id in pods else 'unknown',
-                        'metrics': info.get('health_metrics', {}).get('pod_stats', {}).get(pod_id, {})
-                    }
-                    for pod_id in info['pods']
-                ],
-                'last_heartbeat': info['last_heartbeat'].isoformat()
+                'health_metrics': hm,
+                'health_status': info.get('health_status') or {},
+                'pods': pod_entries,
+                'last_heartbeat': wall_now - timedelta(microseconds=(mono_now_ns - info['last_heartbeat_ns']) // 1000)
             }
-            for node_id, info in nodes.items()
-        }
-    }
-    return jsonify(status)
+    _status_cache['blob'] = orjson.dumps({'nodes': node_status})
+    _status_cache['ts'] = mono_now
+    return Response(_status_cache['blob'], mimetype='application/json')
 
 if __name__ == '__main__':
     logger.info("Starting API server...")
+    # Let the background loops finish their current pass and release their Docker connections
+    atexit.register(_request_shutdown)
+    signal.signal(signal.SIGTERM, _handle_sigterm)
     # Start health monitoring thread in a separate process
-    threading.Thread(target=HealthMonitor.check_health, daemon=True).start()
-    logger.info("Health monitoring thread started")
-    app.run(host='0.0.0.0', port=5001, debug=True) 
\ No newline at end of file
+    threading.Thread(target=HealthMonitor.start_event_listener, daemon=True).start()
+    threading.Thread(target=HealthMonitor.run_stats_loop, daemon=True).start()
+    logger.info("Container event and heartbeat/health monitoring threads started")
+    threading.Thread(target=run_node_pool_refiller, daemon=True).start()
+    logger.info(f"Warm node pool refiller started (pool size {NODE_POOL_SIZE})")
+    if DEBUG:
+        # No reloader: it would re-import this module and start a second set of
+        # monitor threads and Docker containers
+        app.run(host='0.0.0.0', port=5001, debug=True, use_reloader=False)
+    else:
+        # Waitress handles requests on a thread pool, so a slow Docker call in one
+        # request no longer holds up the others
+        serve(app, host='0.0.0.0', port=5001, threads=SERVER_THREADS)
@@ -1,10 +1,15 @@
 from flask import Flask, render_template, request, jsonify
+from waitress import serve
 import requests
 import json
+import os
 
 app = Flask(__name__)
 API_BASE_URL = 'http://127.0.0.1:5001'
 
+# Set WEB_DEBUG=1 to run on the Flask debug server instead of waitress
+DEBUG = os.environ.get('WEB_DEBUG') == '1'
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -45,4 +50,7 @@ def create_pod():
 
 # Run the web interface
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5002, debug=True) 
\ No newline at end of file
+    if DEBUG:
+        app.run(host='0.0.0.0', port=5002, debug=True)
+    else:
+        serve(app, host='0.0.0.0', port=5002, threads=8)